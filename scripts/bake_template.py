@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Bake index-template.html into a Python module of pre-split literal chunks.
+
+The template's static structure never changes between runs, so the grid
+split, token substitution, and cosmetic cleanup are all done once here.
+The generated module (_template_parts.py) holds alternating literal bytes
+and dynamic-token names; generate_index just writes the literals and
+interpolates the three dynamic values, with no regex passes at run time.
+"""
+import os
+import re
+from pathlib import Path
+
+# The generated module lives next to the scripts so it imports like one
+BAKED_MODULE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                            '_template_parts.py')
+
+# Dynamic tokens survive baking as NUL-delimited sentinels (NUL cannot occur
+# in the template), then the cleaned text is split back apart around them
+_SENTINEL_RE = re.compile('\x00([a-z_]+)\x00')
+
+
+def _substitute_sentinel(match):
+    token = match.group(0)
+    if token == '{{.TotalReports}}':
+        return '\x00total_reports\x00'
+    if token == '{{.LastUpdated}}':
+        return '\x00last_updated\x00'
+    if token.startswith('{{if .LatestReport}}'):
+        return '\x00latest_block\x00'
+    # Anything else is unhandled template syntax; drop it
+    return ''
+
+
+def _bake_half(half, token_re, clean):
+    """Reduce one template half to ((literal bytes, token name), ...) pairs."""
+    cleaned = clean(token_re.sub(_substitute_sentinel, half))
+    pieces = _SENTINEL_RE.split(cleaned)
+    parts = [(pieces[i].encode('utf-8'), pieces[i + 1])
+             for i in range(0, len(pieces) - 1, 2)]
+    parts.append((pieces[-1].encode('utf-8'), None))
+    return tuple(parts)
+
+
+def bake(template_file='index-template.html'):
+    """Regenerate _template_parts.py from the current template."""
+    # Imported here, not at module level, to avoid a circular import with
+    # generate_index (which imports this module to trigger re-baking)
+    from generate_index import _GRID_RE, _TOKEN_RE, clean_html_template_syntax
+
+    st = os.stat(template_file)
+    template = Path(template_file).read_bytes().decode('utf-8')
+    halves = _GRID_RE.split(template, maxsplit=1)
+    pre_grid = _bake_half(halves[0], _TOKEN_RE, clean_html_template_syntax)
+    post_grid = (_bake_half(halves[1], _TOKEN_RE, clean_html_template_syntax)
+                 if len(halves) == 2 else ())
+
+    lines = [
+        '"""Pre-split literal chunks of index-template.html.',
+        '',
+        'Generated by bake_template.py; rebuilt automatically when the',
+        'template changes. Do not edit by hand."""',
+        f'TEMPLATE_MTIME_NS = {st.st_mtime_ns}',
+        f'HAS_GRID = {len(halves) == 2}',
+        f'PRE_GRID = {pre_grid!r}',
+        f'POST_GRID = {post_grid!r}',
+    ]
+    # Write-then-rename so a concurrent import never sees a half-written module
+    tmp_path = BAKED_MODULE + '.tmp'
+    Path(tmp_path).write_bytes(('\n'.join(lines) + '\n').encode('utf-8'))
+    os.replace(tmp_path, BAKED_MODULE)
+    return BAKED_MODULE
+
+
+if __name__ == '__main__':
+    print(f'Baked template into {bake()}')
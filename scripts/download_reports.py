@@ -2,66 +2,167 @@
 """
 Download historical reports from GitHub Pages using the manifest file.
 """
+import asyncio
 import json
 import os
 import subprocess
 from datetime import datetime
+from email.utils import formatdate
 import sys
 
+try:
+    import aiohttp
+    import aiofiles
+except ImportError:
+    # Fall back to per-file curl downloads when the async HTTP stack is unavailable
+    aiohttp = None
+    aiofiles = None
+
+try:
+    import orjson
+except ImportError:
+    # Fall back to the stdlib json module
+    orjson = None
+
+MAX_CONCURRENT_DOWNLOADS = 16
+
+
+async def _fetch(session, sem, job):
+    """Download a single file, returning (report_index, success, filename, error)."""
+    url, local_path, filename, report_index = job
+    try:
+        headers = {}
+        if os.path.exists(local_path):
+            # Let the server 304 files our local copy already matches
+            headers['If-Modified-Since'] = formatdate(os.path.getmtime(local_path), usegmt=True)
+        async with sem:
+            async with session.get(url, headers=headers) as response:
+                if response.status == 304:
+                    return (report_index, True, filename, None)
+                if response.status != 200:
+                    return (report_index, False, filename, None)
+                # A 1 MiB buffer batches the 64 KiB chunks into fewer write syscalls
+                async with aiofiles.open(local_path, 'wb', buffering=1 << 20) as f:
+                    async for chunk in response.content.iter_chunked(65536):
+                        await f.write(chunk)
+        return (report_index, True, filename, None)
+    except Exception as e:
+        return (report_index, False, filename, e)
+
+
+async def _run(jobs):
+    """Run all download jobs against a single keep-alive connection pool."""
+    sem = asyncio.Semaphore(MAX_CONCURRENT_DOWNLOADS)
+    connector = aiohttp.TCPConnector(limit=MAX_CONCURRENT_DOWNLOADS, ttl_dns_cache=300)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        return await asyncio.gather(*(_fetch(session, sem, job) for job in jobs))
+
+
+def _run_with_curl(jobs):
+    """Fallback: hand curl the entire job list in one invocation so it reuses
+    connections across every file and parallelizes transfers itself."""
+    if not jobs:
+        return []
+
+    args = ['curl', '--parallel',
+            '--parallel-max', str(MAX_CONCURRENT_DOWNLOADS), '--http2']
+    for i, (url, local_path, _filename, _idx) in enumerate(jobs):
+        # --next separates per-URL options so each file can carry its own
+        # conditional-download flag; --parallel stays global
+        if i > 0:
+            args.append('--next')
+        args.extend(['--fail', '--silent', '-o', local_path, url])
+        if os.path.exists(local_path):
+            # Only fetch the body when the server copy is newer than ours
+            args.extend(['-z', local_path])
+    try:
+        subprocess.run(args, capture_output=True)
+    except Exception as e:
+        return [(report_index, False, filename, e)
+                for _url, _path, filename, report_index in jobs]
+
+    # curl --fail discards failed outputs, so judge success by the file landing
+    return [(report_index,
+             os.path.exists(local_path) and os.path.getsize(local_path) > 0,
+             filename, None)
+            for _url, local_path, filename, report_index in jobs]
+
 
 def download_reports_from_manifest(manifest_file, cutoff_days=28):
     """Download reports from manifest, filtering by age."""
     try:
-        with open(manifest_file, 'r') as f:
-            manifest = json.load(f)
-        
+        if orjson is not None:
+            with open(manifest_file, 'rb') as f:
+                manifest = orjson.loads(f.read())
+        else:
+            with open(manifest_file, 'r') as f:
+                manifest = json.load(f)
+
         base_url = 'https://ethpandaops.github.io/hermes-peer-score/'
-        cutoff_date = datetime.strptime(os.environ.get('CUTOFF_DATE'), '%Y-%m-%d')
+        # Validate the cutoff once; the per-report filter compares the
+        # YYYY-MM-DD strings directly, which sort chronologically
+        cutoff_str = os.environ.get('CUTOFF_DATE')
+        datetime.strptime(cutoff_str, '%Y-%m-%d')
         downloaded_count = 0
-        
+
         # Track validation mode statistics
         validation_mode_stats = {'delegated': 0, 'independent': 0, 'unknown': 0}
-        
+
+        # Build the full download job list up front so every file goes through
+        # one connection pool instead of a curl subprocess per file
+        jobs = []
+        retained_reports = []
+        date_dirs = set()
         for report in manifest.get('reports', []):
-            report_date = datetime.strptime(report['date'], '%Y-%m-%d')
-            
             # Skip reports older than cutoff
-            if report_date < cutoff_date:
+            if report['date'] < cutoff_str:
                 continue
-            
+
             # Track validation mode
             validation_mode = report.get('validation_mode', 'unknown')
             if validation_mode in validation_mode_stats:
                 validation_mode_stats[validation_mode] += 1
             else:
                 validation_mode_stats['unknown'] += 1
-                
-            # Create directory
-            date_dir = f"reports/{report['date']}"
-            os.makedirs(date_dir, exist_ok=True)
-            
-            # Download each file for this report
-            files_downloaded = 0
+
+            date_dirs.add(f"reports/{report['date']}")
+
+            # Queue each file for this report
             for file_info in report.get('files', []):
                 file_url = base_url + file_info['path']
                 local_path = f"reports/{file_info['path']}"
-                
-                try:
-                    result = subprocess.run(['curl', '-f', '-s', file_url, '-o', local_path], 
-                                          capture_output=True)
-                    if result.returncode == 0:
-                        files_downloaded += 1
-                        print(f'  Downloaded: {file_info["filename"]} (validation: {validation_mode})')
-                    else:
-                        print(f'  Failed to download: {file_info["filename"]}')
-                except Exception as e:
-                    print(f'  Error downloading {file_info["filename"]}: {e}')
-            
-            if files_downloaded > 0:
+                jobs.append((file_url, local_path, file_info['filename'],
+                             len(retained_reports)))
+
+            retained_reports.append((report, validation_mode))
+
+        # Create each unique date directory once, not per report
+        for date_dir in date_dirs:
+            os.makedirs(date_dir, exist_ok=True)
+
+        if aiohttp is not None:
+            results = asyncio.run(_run(jobs))
+        else:
+            results = _run_with_curl(jobs)
+
+        # Per-file logging driven by the gathered download results
+        files_downloaded = [0] * len(retained_reports)
+        for report_index, success, filename, error in results:
+            validation_mode = retained_reports[report_index][1]
+            if success:
+                files_downloaded[report_index] += 1
+                print(f'  Downloaded: {filename} (validation: {validation_mode})')
+            elif error is not None:
+                print(f'  Error downloading {filename}: {error}')
+            else:
+                print(f'  Failed to download: {filename}')
+
+        for (report, validation_mode), file_count in zip(retained_reports, files_downloaded):
+            if file_count > 0:
                 downloaded_count += 1
                 hermes_version = report.get('hermes_version', 'unknown')
-                print(f'Successfully downloaded {files_downloaded} files for {report["date"]} ({validation_mode} validation, Hermes {hermes_version})')
-        
+                print(f'Successfully downloaded {file_count} files for {report["date"]} ({validation_mode} validation, Hermes {hermes_version})')
+
         print(f'Total reports preserved: {downloaded_count}')
         print(f'Validation mode distribution:')
         for mode, count in validation_mode_stats.items():
@@ -70,7 +171,7 @@ def download_reports_from_manifest(manifest_file, cutoff_days=28):
                 mode_icon = '🔗' if mode == 'delegated' else '⚡' if mode == 'independent' else '❓'
                 print(f'  {mode_icon} {mode.capitalize()}: {count} reports ({percentage:.1f}%)')
         return True
-        
+
     except Exception as e:
         print(f'Error processing manifest: {e}')
         return False
@@ -78,4 +179,4 @@ def download_reports_from_manifest(manifest_file, cutoff_days=28):
 
 if __name__ == '__main__':
     success = download_reports_from_manifest('reports-manifest.json')
-    sys.exit(0)  # Don't fail the build, just continue without historical data
\ No newline at end of file
+    sys.exit(0)  # Don't fail the build, just continue without historical data
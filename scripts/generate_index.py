@@ -2,39 +2,314 @@
 """
 Generate the historical index page and reports manifest.
 """
+import functools
+import hashlib
+import importlib
 import os
 import json
 import re
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from operator import itemgetter
 from pathlib import Path
 
+try:
+    import ijson
+except ImportError:
+    # Fall back to full-document parsing when the streaming parser is unavailable
+    ijson = None
+
+try:
+    import orjson
+except ImportError:
+    # Fall back to the stdlib json module
+    orjson = None
+
+# Report files are immutable once written, so parsed metadata is cached across
+# runs keyed by (path, mtime_ns, size) and only new reports pay the JSON parse
+METADATA_CACHE_FILE = 'reports/.metadata-cache.json'
+
+# Malformed or unreadable report files are the only parse failures we expect;
+# anything else (bugs, MemoryError) should surface rather than be swallowed
+if ijson is not None:
+    _PARSE_ERRORS = (ijson.JSONError, OSError)
+elif orjson is not None:
+    _PARSE_ERRORS = (orjson.JSONDecodeError, OSError)
+else:
+    _PARSE_ERRORS = (json.JSONDecodeError, OSError)
+
+# Per-validation-mode styling for the report cards, shared across all iterations
+_MODE_STYLE = {
+    'independent': {
+        'color': 'text-green-600',
+        'bg': 'bg-green-50',
+        'border': 'border-green-200',
+        'icon': '⚡',
+        'label': 'Independent'
+    },
+    'delegated': {
+        'color': 'text-blue-600',
+        'bg': 'bg-blue-50',
+        'border': 'border-blue-200',
+        'icon': '🔗',
+        'label': 'Delegated'
+    }
+}
+
+# Per-validation-mode styling for the latest-report banner
+_LATEST_STYLE = {
+    'independent': {
+        'bg_gradient': 'from-green-50 to-emerald-50',
+        'border_color': 'border-green-200',
+        'title_color': 'text-green-900',
+        'text_color': 'text-green-700',
+        'accent_color': 'text-green-600',
+        'value_color': 'text-green-800',
+        'button_color': 'bg-green-600 hover:bg-green-700',
+        'icon': '⚡',
+        'title': 'Independent Validation'
+    },
+    'delegated': {
+        'bg_gradient': 'from-blue-50 to-indigo-50',
+        'border_color': 'border-blue-200',
+        'title_color': 'text-blue-900',
+        'text_color': 'text-blue-700',
+        'accent_color': 'text-blue-600',
+        'value_color': 'text-blue-800',
+        'button_color': 'bg-blue-600 hover:bg-blue-700',
+        'icon': '🔗',
+        'title': 'Delegated Validation'
+    }
+}
+
+# Template patterns, compiled once at import instead of per call
+_HREF_EMPTY_RE = re.compile(r'href=""[^>]*class=')
+_STRAY_QUOTE_RE = re.compile(r'^\s*">[^<]*$', re.MULTILINE)
+_STRAY_SLASH_RE = re.compile(r'^\s*/$', re.MULTILINE)
+_BLANK_LINES_RE = re.compile(r'\n\s*\n\s*\n')
+# Run-specific timestamps embedded in the outputs; ignored when deciding
+# whether a rewrite would actually change anything
+_GENERATED_AT_RE = re.compile(rb'"generated_at":\s*"[^"]*"')
+_LAST_UPDATED_RE = re.compile(rb'Last updated: [^<]*')
+
+# Canonical report filename matcher covering both layouts: the new
+# '<mode>-<timestamp>' prefix form and the old '<timestamp>-<mode>' suffix
+# form. Group 1 is the canonical timestamp; groups 2-7 are its components
+_REPORT_FILE_RE = re.compile(
+    r'^peer-score-report-(?:delegated-|independent-)?'
+    r'((\d{4})-(\d{2})-(\d{2})_(\d{2})-(\d{2})-(\d{2}))'
+    r'(?:-delegated|-independent)?\.json$')
+
+# Every template construct in one alternation, most specific first, so a
+# single scan substitutes the known placeholders and drops anything unhandled
+# (leftover {{if}}/{{range}} blocks and stray {{.Var}} tokens)
+_TOKEN_RE = re.compile(
+    r'\{\{\.TotalReports\}\}|\{\{\.LastUpdated\}\}|'
+    r'\{\{if \.LatestReport\}\}.*?\{\{end\}\}|'
+    r'\{\{if [^}]+\}\}.*?\{\{end\}\}|'
+    r'\{\{range [^}]+\}\}.*?\{\{end\}\}|'
+    r'\{\{[^}]+\}\}', re.DOTALL)
+
+# Grid placeholder, used to split the template so report cards can stream
+# straight to the output file instead of being spliced into one giant string
+_GRID_RE = re.compile(
+    r'<!-- Reports Grid -->\s*<div class="grid[^>]*?id="reportsGrid"[^>]*>\s*'
+    r'\{\{range [^}]+\}\}.*?\{\{end\}\}\s*</div>', re.DOTALL)
+
+# Opening tag of the generated grid container
+_GRID_OPEN = '<div class="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-6" id="reportsGrid">'
+
+
+# strftime does locale work on every call; many reports share a timestamp
+# format, so cache the rendered strings per (datetime, format) pair
+_strftime_cache = {}
+
+
+def _fmt(dt, fmt):
+    key = (dt, fmt)
+    value = _strftime_cache.get(key)
+    if value is None:
+        value = _strftime_cache[key] = dt.strftime(fmt)
+    return value
+
+
+def _unchanged(old_bytes, new_bytes, volatile_re):
+    """Compare two outputs ignoring their run-specific timestamp."""
+    return (hashlib.blake2b(volatile_re.sub(b'', old_bytes)).digest() ==
+            hashlib.blake2b(volatile_re.sub(b'', new_bytes)).digest())
+
+
+def write_if_changed(path, data, volatile_re):
+    """Write data to path unless the existing content already matches.
+
+    Skipping the no-op rewrite keeps CI re-runs from churning git diffs and
+    triggering a GitHub Pages republish for identical content.
+    """
+    try:
+        with open(path, 'rb') as f:
+            old = f.read()
+    except FileNotFoundError:
+        old = None
+    if old is not None and _unchanged(old, data, volatile_re):
+        return False
+    with open(path, 'wb') as f:
+        f.write(data)
+    return True
+
+
+def replace_if_changed(tmp_path, final_path, volatile_re):
+    """Promote a streamed temp file over final_path unless it is unchanged."""
+    try:
+        with open(final_path, 'rb') as f:
+            old = f.read()
+    except FileNotFoundError:
+        old = None
+    if old is not None:
+        with open(tmp_path, 'rb') as f:
+            new = f.read()
+        if _unchanged(old, new, volatile_re):
+            os.remove(tmp_path)
+            return False
+    os.replace(tmp_path, final_path)
+    return True
+
+
+@functools.lru_cache(maxsize=1)
+def load_template():
+    """Read the index template once per process."""
+    return Path('index-template.html').read_bytes().decode('utf-8')
+
+
+def _load_baked_template():
+    """Import the pre-split template module, re-baking when the template file
+    has changed since it was generated. Returns None when baking is not
+    possible, in which case the caller falls back to the regex pipeline."""
+    try:
+        template_mtime_ns = os.stat('index-template.html').st_mtime_ns
+        import bake_template
+        try:
+            import _template_parts
+        except ImportError:
+            _template_parts = None
+        if _template_parts is None or _template_parts.TEMPLATE_MTIME_NS != template_mtime_ns:
+            bake_template.bake()
+            if _template_parts is None:
+                import _template_parts
+            else:
+                _template_parts = importlib.reload(_template_parts)
+        return _template_parts
+    except Exception as e:
+        # The runtime pipeline produces the same output, just slower; never
+        # let a baking problem fail the CI build
+        print(f"Template baking unavailable, using runtime pipeline: {e}")
+        return None
 
-def parse_report_metadata(json_file):
-    """Extract metadata from a JSON report file."""
+
+def load_metadata_cache():
+    """Load the persisted metadata cache, tolerating a missing or corrupt file."""
+    try:
+        with open(METADATA_CACHE_FILE, 'rb') as f:
+            raw = f.read()
+        return orjson.loads(raw) if orjson is not None else json.loads(raw)
+    except Exception:
+        return {}
+
+
+def save_metadata_cache(cache):
+    """Persist the metadata cache, evicting entries for deleted files."""
+    cache = {path: entry for path, entry in cache.items() if os.path.exists(path)}
     try:
+        if orjson is not None:
+            data = orjson.dumps(cache)
+        else:
+            data = json.dumps(cache).encode('utf-8')
+        with open(METADATA_CACHE_FILE, 'wb') as f:
+            f.write(data)
+    except Exception as e:
+        print(f"Warning: could not write metadata cache: {e}")
+
+
+def _extract_report_fields_streaming(json_file):
+    """Stream-parse a report, touching only the needed keys.
+
+    Large reports are dominated by the per-peer map; iterating the parse
+    events keeps memory at O(1) instead of materializing the whole document.
+    """
+    fields = {
+        'total_connections': 0,
+        'successful_handshakes': 0,
+        'duration': 0,
+        'validation_mode': 'delegated',
+        'hermes_version': 'unknown',
+        'has_ai_analysis': False,
+        'unique_peers': 0,
+        'total_messages': 0
+    }
+    with open(json_file, 'rb') as f:
+        for prefix, event, value in ijson.parse(f):
+            if prefix in ('total_connections', 'successful_handshakes', 'duration'):
+                fields[prefix] = value or 0
+            elif prefix == 'validation_mode' and event == 'string':
+                fields['validation_mode'] = value
+            elif prefix == 'validation_config.hermes_version' and event == 'string':
+                fields['hermes_version'] = value
+            elif prefix == 'ai_analysis' and event == 'map_key':
+                fields['has_ai_analysis'] = True
+            elif prefix == 'peers' and event == 'map_key':
+                fields['unique_peers'] += 1
+            elif event == 'number' and prefix.endswith('.total_message_count') and prefix.startswith('peers.'):
+                fields['total_messages'] += value or 0
+    return fields
+
+
+def _extract_report_fields_full(json_file):
+    """Load the whole report document and pull out the needed fields."""
+    if orjson is not None:
+        with open(json_file, 'rb') as f:
+            data = orjson.loads(f.read())
+    else:
         with open(json_file, 'r') as f:
             data = json.load(f)
 
+    peers_data = data.get('peers', {})
+    return {
+        'total_connections': data.get('total_connections', 0),
+        'successful_handshakes': data.get('successful_handshakes', 0),
+        'duration': data.get('duration', 0) or 0,
+        'validation_mode': data.get('validation_mode', 'delegated'),
+        'hermes_version': data.get('validation_config', {}).get('hermes_version', 'unknown'),
+        'has_ai_analysis': bool(data.get('ai_analysis')),
+        'unique_peers': len(peers_data),
+        'total_messages': sum(peer.get('total_message_count', 0) for peer in peers_data.values())
+    }
+
+
+def parse_report_metadata(json_file):
+    """Extract metadata from a JSON report file."""
+    try:
+        if ijson is not None:
+            fields = _extract_report_fields_streaming(json_file)
+        else:
+            fields = _extract_report_fields_full(json_file)
+
         # Calculate success rate
-        total_connections = data.get('total_connections', 0)
-        successful_handshakes = data.get('successful_handshakes', 0)
+        total_connections = fields['total_connections']
+        successful_handshakes = fields['successful_handshakes']
         success_rate = (successful_handshakes / total_connections * 100) if total_connections > 0 else 0
 
         # Extract validation mode and related metadata
-        validation_mode = data.get('validation_mode', 'delegated')
-        validation_config = data.get('validation_config', {})
+        validation_mode = fields['validation_mode']
 
         # Extract basic metadata (removed hardcoded validation metrics)
-        hermes_version = validation_config.get('hermes_version', 'unknown')
+        hermes_version = fields['hermes_version']
 
         # Since we removed hardcoded metrics, we'll use basic connection success as a proxy
         validation_success_rate = success_rate  # Use connection success rate
 
         # For display purposes, calculate simple metrics from actual data
-        peers_data = data.get('peers', {})
-        total_messages = sum(peer.get('total_message_count', 0) for peer in peers_data.values())
+        duration = fields['duration']
         avg_latency_ms = 0  # No longer tracked in hardcoded metrics
-        messages_per_sec = round(total_messages / (data.get('duration', 1) / 1000000000), 1) if data.get('duration') else 0
+        messages_per_sec = round(fields['total_messages'] / (duration / 1000000000), 1) if duration else 0
         error_rate = round(100 - success_rate, 2) if success_rate < 100 else 0  # Inverse of success rate
 
         # Resource metrics are no longer hardcoded
@@ -43,12 +318,12 @@ def parse_report_metadata(json_file):
         cache_hit_rate = 0
 
         return {
-            'unique_peers': len(data.get('peers', {})),
+            'unique_peers': fields['unique_peers'],
             'total_connections': total_connections,
             'successful_handshakes': successful_handshakes,
             'success_rate': round(success_rate, 1),
-            'test_duration': round(data.get('duration', 0) / 1000000000, 1) if data.get('duration') else 0,
-            'has_ai_analysis': bool(data.get('ai_analysis')),
+            'test_duration': round(duration / 1000000000, 1) if duration else 0,
+            'has_ai_analysis': fields['has_ai_analysis'],
             'validation_mode': validation_mode,
             'hermes_version': hermes_version,
             'validation_success_rate': round(validation_success_rate * 100, 1),
@@ -59,41 +334,25 @@ def parse_report_metadata(json_file):
             'memory_usage': memory_usage,
             'cache_hit_rate': cache_hit_rate
         }
-    except Exception as e:
+    except _PARSE_ERRORS as e:
         print(f"Error parsing {json_file}: {e}")
         return None
 
 
-def generate_reports_grid_html(reports):
-    """Generate the HTML for the reports grid with validation mode support."""
-    reports_grid_html = '<div class="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-6" id="reportsGrid">'
-
-    for report in reports:
-        html_path = report.get('html_path', '#')
-        html_link = f'href="{html_path}"' if html_path and html_path != '#' else 'href="#" onclick="alert(\'HTML report not available for this date\')"'
+def render_report_card(report):
+    """Render one grid card with validation mode support."""
+    html_path = report.get('html_path', '#')
+    html_link = f'href="{html_path}"' if html_path and html_path != '#' else 'href="#" onclick="alert(\'HTML report not available for this date\')"'
 
-        # Validation mode styling
-        validation_mode = report.get('validation_mode', 'delegated')
-        mode_class = f'validation-mode-{validation_mode}'
-
-        # Mode-specific styling and icons
-        if validation_mode == 'independent':
-            mode_color = 'text-green-600'
-            mode_bg = 'bg-green-50'
-            mode_border = 'border-green-200'
-            mode_icon = '⚡'
-            mode_label = 'Independent'
-        else:
-            mode_color = 'text-blue-600'
-            mode_bg = 'bg-blue-50'
-            mode_border = 'border-blue-200'
-            mode_icon = '🔗'
-            mode_label = 'Delegated'
+    # Validation mode styling
+    validation_mode = report.get('validation_mode', 'delegated')
+    mode_class = f'validation-mode-{validation_mode}'
+    style = _MODE_STYLE.get(validation_mode, _MODE_STYLE['delegated'])
 
-        # Extract basic info
-        hermes_version = report.get('hermes_version', 'unknown')
+    # Extract basic info
+    hermes_version = report.get('hermes_version', 'unknown')
 
-        reports_grid_html += f'''
+    return f'''
             <div class="report-card bg-white rounded-lg shadow-md p-6 data-report {mode_class}"
                  data-date="{report['date']}"
                  data-peers="{report['unique_peers']}"
@@ -106,13 +365,13 @@ def generate_reports_grid_html(reports):
                         <h3 class="text-lg font-semibold text-gray-900">{report['formatted_date']}</h3>
                         <div class="text-xs text-gray-500 mt-1">{hermes_version}</div>
                         <div class="mt-1">
-                            <span class="inline-flex items-center px-2 py-1 rounded-full text-xs font-medium {mode_bg} {mode_color} {mode_border} border">
-                                {mode_icon} {mode_label}
+                            <span class="inline-flex items-center px-2 py-1 rounded-full text-xs font-medium {style['bg']} {style['color']} {style['border']} border">
+                                {style['icon']} {style['label']}
                             </span>
                         </div>
                     </div>
                     <div class="text-right">
-                        <div class="text-sm font-medium {mode_color}">{report['test_duration']}s</div>
+                        <div class="text-sm font-medium {style['color']}">{report['test_duration']}s</div>
                     </div>
                 </div>
 
@@ -128,9 +387,6 @@ def generate_reports_grid_html(reports):
                 </div>
             </div>'''
 
-    reports_grid_html += '</div>'
-    return reports_grid_html
-
 
 def generate_latest_report_html(latest_report):
     """Generate HTML for the latest report section with validation mode support."""
@@ -138,54 +394,32 @@ def generate_latest_report_html(latest_report):
     hermes_version = latest_report.get('hermes_version', 'unknown')
 
     # Mode-specific styling and content
-    if validation_mode == 'independent':
-        bg_gradient = 'from-green-50 to-emerald-50'
-        border_color = 'border-green-200'
-        title_color = 'text-green-900'
-        text_color = 'text-green-700'
-        accent_color = 'text-green-600'
-        value_color = 'text-green-800'
-        button_color = 'bg-green-600 hover:bg-green-700'
-        mode_icon = '⚡'
-        mode_title = 'Independent Validation'
-    else:
-        bg_gradient = 'from-blue-50 to-indigo-50'
-        border_color = 'border-blue-200'
-        title_color = 'text-blue-900'
-        text_color = 'text-blue-700'
-        accent_color = 'text-blue-600'
-        value_color = 'text-blue-800'
-        button_color = 'bg-blue-600 hover:bg-blue-700'
-        mode_icon = '🔗'
-        mode_title = 'Delegated Validation'
-
-    # Get basic info
-    hermes_version = latest_report.get('hermes_version', 'unknown')
+    style = _LATEST_STYLE.get(validation_mode, _LATEST_STYLE['delegated'])
 
-    return f'''<div class="bg-gradient-to-r {bg_gradient} border {border_color} rounded-lg shadow p-6 mb-6">
+    return f'''<div class="bg-gradient-to-r {style['bg_gradient']} border {style['border_color']} rounded-lg shadow p-6 mb-6">
         <div class="flex items-center justify-between">
             <div>
                 <div class="flex items-center space-x-2 mb-2">
-                    <h2 class="text-xl font-semibold {title_color}">Latest Report</h2>
-                    <span class="inline-flex items-center px-3 py-1 rounded-full text-sm font-medium bg-white {accent_color} border {border_color}">
-                        {mode_icon} {mode_title}
+                    <h2 class="text-xl font-semibold {style['title_color']}">Latest Report</h2>
+                    <span class="inline-flex items-center px-3 py-1 rounded-full text-sm font-medium bg-white {style['accent_color']} border {style['border_color']}">
+                        {style['icon']} {style['title']}
                     </span>
                 </div>
-                <p class="{text_color} mb-3">{latest_report['formatted_date']}</p>
+                <p class="{style['text_color']} mb-3">{latest_report['formatted_date']}</p>
                 <div class="grid grid-cols-2 md:grid-cols-2 gap-4 text-sm">
                     <div>
-                        <span class="{accent_color} font-medium">Duration:</span>
-                        <span class="{value_color}">{latest_report['test_duration']}s</span>
+                        <span class="{style['accent_color']} font-medium">Duration:</span>
+                        <span class="{style['value_color']}">{latest_report['test_duration']}s</span>
                     </div>
                     <div>
-                        <span class="{accent_color} font-medium">Version:</span>
-                        <span class="{value_color}">{hermes_version}</span>
+                        <span class="{style['accent_color']} font-medium">Version:</span>
+                        <span class="{style['value_color']}">{hermes_version}</span>
                     </div>
                 </div>
             </div>
             <div class="flex space-x-3">
                 <a href="{latest_report['html_path'] or '#'}"
-                   class="inline-flex items-center px-4 py-2 {button_color} text-white rounded-md text-sm font-medium transition-colors">
+                   class="inline-flex items-center px-4 py-2 {style['button_color']} text-white rounded-md text-sm font-medium transition-colors">
                     📊 View Report
                 </a>
                 <a href="{latest_report['json_path']}"
@@ -198,169 +432,213 @@ def generate_latest_report_html(latest_report):
 
 
 def clean_html_template_syntax(html):
-    """Clean up any remaining template syntax - conservative approach."""
-    # Remove complete template blocks that weren't handled
-    html = re.sub(r'\{\{if [^}]+\}\}.*?\{\{end\}\}', '', html, flags=re.DOTALL)
-    html = re.sub(r'\{\{range [^}]+\}\}.*?\{\{end\}\}', '', html, flags=re.DOTALL)
-
-    # Remove any standalone {{.Variable}} that weren't replaced
-    html = re.sub(r'\{\{[^}]+\}\}', '', html)
+    """Fix up cosmetic damage left where template syntax was removed.
 
+    Unhandled template blocks and variables are already consumed by the
+    _TOKEN_RE substitution pass; this only repairs what their removal leaves
+    behind.
+    """
     # Fix href attributes
-    html = re.sub(r'href=""[^>]*class=', 'href="#" class=', html)
+    html = _HREF_EMPTY_RE.sub('href="#" class=', html)
 
     # Remove simple template fragments
-    html = re.sub(r'^\s*">[^<]*$', '', html, flags=re.MULTILINE)
-    html = re.sub(r'^\s*/$', '', html, flags=re.MULTILINE)
+    html = _STRAY_QUOTE_RE.sub('', html)
+    html = _STRAY_SLASH_RE.sub('', html)
 
     # Remove double empty lines
-    html = re.sub(r'\n\s*\n\s*\n', '\n\n', html)
+    html = _BLANK_LINES_RE.sub('\n\n', html)
 
     return html
 
 
-def generate_reports_manifest(reports, reports_dir):
-    """Generate the reports manifest JSON file."""
-    manifest_data = {
-        "generated_at": datetime.utcnow().isoformat() + "Z",
-        "total_reports": len(reports),
-        "reports": []
+def build_manifest_entry(report, dir_names):
+    """Build the manifest entry for one report from filenames already resolved
+    during the directory scan."""
+    timestamp = report['timestamp']
+    date = report['date']
+    # The json/html names share this stem, so interpolate it once
+    base = f"peer-score-report-{timestamp}"
+
+    # JS data file - handle both old and new patterns
+    # New pattern: peer-score-report-data-{validation_mode}-{timestamp}.js
+    validation_mode = report.get('validation_mode', 'delegated')
+
+    # Extract timestamp without validation mode prefix for new pattern
+    if timestamp.startswith('delegated-') or timestamp.startswith('independent-'):
+        timestamp_for_js = timestamp.split('-', 1)[1]  # Remove validation mode prefix
+    else:
+        timestamp_for_js = timestamp
+
+    js_filename_new = f"peer-score-report-data-{validation_mode}-{timestamp_for_js}.js"
+
+    # Check which pattern exists (prefer new pattern, default to it too)
+    if js_filename_new in dir_names:
+        js_filename = js_filename_new
+    elif f"{base}-data.js" in dir_names:
+        js_filename = f"{base}-data.js"
+    else:
+        js_filename = js_filename_new
+
+    # JSON always, HTML only when the companion file exists, then JS data
+    report_files = [
+        {"filename": f"{base}.json", "path": f"{date}/{base}.json", "type": "json"},
+        *([{"filename": f"{base}.html", "path": f"{date}/{base}.html", "type": "html"}]
+          if report.get('html_path') else []),
+        {"filename": js_filename, "path": f"{date}/{js_filename}", "type": "javascript"},
+    ]
+
+    return {
+        "date": date,
+        "timestamp": timestamp,
+        "formatted_date": report['formatted_date'],
+        "test_duration": report['test_duration'],
+        "unique_peers": report['unique_peers'],
+        "total_connections": report['total_connections'],
+        "success_rate": report['success_rate'],
+        "validation_mode": validation_mode,
+        "hermes_version": report.get('hermes_version', 'unknown'),
+        "messages_per_sec": report.get('messages_per_sec', 0),
+        "files": report_files
     }
 
-    for report in reports:
-        report_files = []
-
-        # Add JSON file
-        json_filename = f"peer-score-report-{report['timestamp']}.json"
-        report_files.append({
-            "filename": json_filename,
-            "path": f"{report['date']}/{json_filename}",
-            "type": "json"
-        })
-
-        # Add HTML file if it exists
-        if report.get('html_path'):
-            html_filename = f"peer-score-report-{report['timestamp']}.html"
-            report_files.append({
-                "filename": html_filename,
-                "path": f"{report['date']}/{html_filename}",
-                "type": "html"
-            })
 
-        # Add JS data file - handle both old and new patterns
-        # New pattern: peer-score-report-data-{validation_mode}-{timestamp}.js
-        validation_mode = report.get('validation_mode', 'delegated')
-        timestamp_clean = report['timestamp']
-        
-        # Extract timestamp without validation mode prefix for new pattern
-        if timestamp_clean.startswith('delegated-') or timestamp_clean.startswith('independent-'):
-            timestamp_for_js = timestamp_clean.split('-', 1)[1]  # Remove validation mode prefix
-        else:
-            timestamp_for_js = timestamp_clean
-            
-        js_filename_new = f"peer-score-report-data-{validation_mode}-{timestamp_for_js}.js"
-        js_filename_old = f"peer-score-report-{report['timestamp']}-data.js"
-        
-        # Check which pattern exists (prefer new pattern)
-        js_file_new = reports_dir / report['date'] / js_filename_new
-        js_file_old = reports_dir / report['date'] / js_filename_old
-        
-        if js_file_new.exists():
-            js_filename = js_filename_new
-        elif js_file_old.exists():
-            js_filename = js_filename_old
-        else:
-            js_filename = js_filename_new  # Default to new pattern
-        report_files.append({
-            "filename": js_filename,
-            "path": f"{report['date']}/{js_filename}",
-            "type": "javascript"
-        })
-
-        manifest_data["reports"].append({
-            "date": report['date'],
-            "timestamp": report['timestamp'],
-            "formatted_date": report['formatted_date'],
-            "test_duration": report['test_duration'],
-            "unique_peers": report['unique_peers'],
-            "total_connections": report['total_connections'],
-            "success_rate": report['success_rate'],
-            "validation_mode": report.get('validation_mode', 'delegated'),
-            "hermes_version": report.get('hermes_version', 'unknown'),
-            "messages_per_sec": report.get('messages_per_sec', 0),
-            "files": report_files
-        })
-
-    return manifest_data
+def generate_reports_manifest(manifest_entries):
+    """Wrap the per-report manifest entries built during the scan."""
+    return {
+        "generated_at": datetime.utcnow().isoformat() + "Z",
+        "total_reports": len(manifest_entries),
+        "reports": manifest_entries
+    }
 
 
 def generate_index():
     """Generate the index.html file with all historical reports (28-day retention)."""
     reports_dir = Path('reports')
     reports = []
+    manifest_entries = []
+    metadata_cache = load_metadata_cache()
 
-    # Calculate cutoff date (28 days ago)
+    # Calculate cutoff date (28 days ago). The zero-padded timestamp format
+    # sorts chronologically, so the retention filter compares strings and
+    # strptime only runs for files inside the window
     cutoff_date = datetime.now() - timedelta(days=28)
+    cutoff_str = cutoff_date.strftime('%Y-%m-%d_%H-%M-%S')
 
-    # Find all JSON reports (within 28-day retention period)
-    for json_file in reports_dir.glob('**/peer-score-report-*.json'):
-        date_dir = json_file.parent.name
-        filename = json_file.name
-
-        # Extract timestamp from filename - handle both old and new formats
-        timestamp_part = filename.replace('peer-score-report-', '').replace('.json', '')
-
-        # Handle new format: delegated-YYYY-MM-DD_HH-MM-SS or independent-YYYY-MM-DD_HH-MM-SS
-        if timestamp_part.startswith('delegated-') or timestamp_part.startswith('independent-'):
-            # New format: remove validation mode prefix
-            if timestamp_part.startswith('delegated-'):
-                timestamp_part = timestamp_part[len('delegated-'):]
-            elif timestamp_part.startswith('independent-'):
-                timestamp_part = timestamp_part[len('independent-'):]
-        else:
-            # Old format: remove validation mode suffixes if present
-            for suffix in ['-delegated', '-independent']:
-                if timestamp_part.endswith(suffix):
-                    timestamp_part = timestamp_part[:-len(suffix)]
-                    break
+    # Find all JSON reports (within 28-day retention period). Reports live
+    # exactly two levels deep (reports/<date>/<file>), so two scandir passes
+    # reuse the cached DirEntry stat instead of a recursive glob
+    try:
+        with os.scandir(reports_dir) as it:
+            date_paths = sorted(e.path for e in it if e.is_dir(follow_symlinks=False))
+    except FileNotFoundError:
+        date_paths = []
+
+    candidates = []
+
+    for date_path in date_paths:
+        date_dir = os.path.basename(date_path)
+        with os.scandir(date_path) as it:
+            file_entries = [e for e in it if e.is_file(follow_symlinks=False)]
+        # Companion-file lookups (html, js data) answer from this set instead
+        # of paying a stat per candidate
+        dir_names = {e.name for e in file_entries}
+
+        for entry in file_entries:
+            filename = entry.name
+            if not (filename.startswith('peer-score-report-') and filename.endswith('.json')):
+                continue
 
-        try:
-            # Parse the timestamp
-            report_date = datetime.strptime(timestamp_part, '%Y-%m-%d_%H-%M-%S')
+            # Extract timestamp from filename - handle both old and new formats
+            timestamp_match = _REPORT_FILE_RE.match(filename)
+            if not timestamp_match:
+                print(f"Could not parse timestamp from {filename}")
+                continue
+            timestamp_part = timestamp_match.group(1)
 
             # Skip reports older than 28 days
-            if report_date < cutoff_date:
+            if timestamp_part < cutoff_str:
                 print(f"Skipping old report: {timestamp_part}")
                 continue
 
-            # Get metadata
-            metadata = parse_report_metadata(json_file)
-            if metadata is None:
+            try:
+                # The regex already isolated the six fields, so build the
+                # datetime directly rather than re-parsing via strptime
+                report_date = datetime(*map(int, timestamp_match.groups()[1:7]))
+            except ValueError as e:
+                print(f"Could not parse timestamp from {filename}: {e}")
                 continue
 
-            # Determine file paths
-            html_file = json_file.with_suffix('.html')
+            # Reuse the cached parse when the file is unchanged; uncached
+            # files are parsed in parallel below
+            st = entry.stat()
+            cache_entry = metadata_cache.get(entry.path)
+            if cache_entry and cache_entry.get('mtime_ns') == st.st_mtime_ns and cache_entry['size'] == st.st_size:
+                metadata = cache_entry['metadata']
+            else:
+                metadata = None
+
+            candidates.append({
+                'path': entry.path,
+                'mtime_ns': st.st_mtime_ns,
+                'size': st.st_size,
+                'filename': filename,
+                'date_dir': date_dir,
+                'dir_names': dir_names,
+                'report_date': report_date,
+                # The YYYY-MM-DD prefix of the timestamp is already the date
+                # string, so no strftime needed for it later
+                'date_str': timestamp_part[:10],
+                'metadata': metadata
+            })
 
-            html_path = f"{date_dir}/{html_file.name}" if html_file.exists() else None
-            json_path = f"{date_dir}/{json_file.name}"
+    # Parse uncached reports in parallel; each parse is independent and mostly
+    # blocking file I/O, so a thread pool fans out the cold-cache case
+    to_parse = [c for c in candidates if c['metadata'] is None]
+    if to_parse:
+        max_workers = min(32, (os.cpu_count() or 4) * 4)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            parsed = list(executor.map(parse_report_metadata, [c['path'] for c in to_parse]))
+        for candidate, metadata in zip(to_parse, parsed):
+            candidate['metadata'] = metadata
+            if metadata is not None:
+                metadata_cache[candidate['path']] = {
+                    'mtime_ns': candidate['mtime_ns'],
+                    'size': candidate['size'],
+                    'metadata': metadata
+                }
+
+    for candidate in candidates:
+        metadata = candidate['metadata']
+        if metadata is None:
+            continue
 
-            # For display purposes, use the original timestamp + validation mode
-            display_timestamp = filename.replace('peer-score-report-', '').replace('.json', '')
+        filename = candidate['filename']
+        report_date = candidate['report_date']
 
-            reports.append({
-                'date': report_date.strftime('%Y-%m-%d'),
-                'timestamp': display_timestamp,  # Use full timestamp with validation mode
-                'formatted_date': report_date.strftime('%B %d, %Y at %H:%M'),
-                'html_path': html_path,
-                'json_path': json_path,
-                **metadata
-            })
-        except ValueError as e:
-            print(f"Could not parse timestamp from {filename}: {e}")
-            continue
+        # Determine file paths
+        html_name = filename[:-len('.json')] + '.html'
+
+        html_path = f"{candidate['date_dir']}/{html_name}" if html_name in candidate['dir_names'] else None
+        json_path = f"{candidate['date_dir']}/{filename}"
+
+        # For display purposes, use the original timestamp + validation mode;
+        # the prefix/suffix are fixed so slicing beats two replace() passes
+        display_timestamp = filename[len('peer-score-report-'):-len('.json')]
+
+        report = {
+            'date': candidate['date_str'],
+            'timestamp': display_timestamp,  # Use full timestamp with validation mode
+            'formatted_date': _fmt(report_date, '%B %d, %Y at %H:%M'),
+            'html_path': html_path,
+            'json_path': json_path,
+            **metadata
+        }
+        reports.append(report)
+        manifest_entries.append(build_manifest_entry(report, candidate['dir_names']))
 
     # Sort by timestamp (newest first) - this ensures proper ordering when multiple reports exist for the same day
-    reports.sort(key=lambda x: x['timestamp'], reverse=True)
+    reports.sort(key=itemgetter('timestamp'), reverse=True)
+    manifest_entries.sort(key=itemgetter('timestamp'), reverse=True)
 
     # Prepare template data
     template_data = {
@@ -370,41 +648,76 @@ def generate_index():
         'last_updated': datetime.utcnow().strftime('%B %d, %Y at %H:%M UTC')
     }
 
-    # Read template
-    with open('index-template.html', 'r') as f:
-        template = f.read()
-
-    # Simple template replacement
-    html = template.replace('{{.TotalReports}}', str(template_data['total_reports']))
-    html = html.replace('{{.LastUpdated}}', template_data['last_updated'])
-
-    # Handle latest report section
+    # Render the latest-report section (removed entirely when there are no
+    # reports), then fill in the scalar placeholders
     if template_data['latest_report']:
         latest_block = generate_latest_report_html(template_data['latest_report'])
-        html = re.sub(r'\{\{if \.LatestReport\}\}.*?\{\{end\}\}', latest_block, html, flags=re.DOTALL)
     else:
-        # Remove the latest report section entirely
-        html = re.sub(r'\{\{if \.LatestReport\}\}.*?\{\{end\}\}', '', html, flags=re.DOTALL)
-
-    # Generate and replace reports grid - replace the entire template section
-    reports_grid_html = generate_reports_grid_html(reports)
-
-    # Replace the entire grid section including the template range using regex
-    grid_pattern = r'<!-- Reports Grid -->\s*<div class="grid[^>]*?id="reportsGrid"[^>]*>\s*\{\{range [^}]+\}\}.*?\{\{end\}\}\s*</div>'
-    grid_replacement = f'<!-- Reports Grid -->\n        {reports_grid_html}'
-    html = re.sub(grid_pattern, grid_replacement, html, flags=re.DOTALL)
+        latest_block = ''
 
-    # Clean up any remaining template syntax
-    html = clean_html_template_syntax(html)
+    token_values = {
+        'total_reports': str(template_data['total_reports']).encode('utf-8'),
+        'last_updated': template_data['last_updated'].encode('utf-8'),
+        'latest_block': latest_block.encode('utf-8'),
+    }
 
-    # Write the final index
-    with open('reports/index.html', 'w') as f:
-        f.write(html)
+    def write_parts(f, parts):
+        for literal, token in parts:
+            f.write(literal)
+            if token is not None:
+                f.write(token_values[token])
+
+    def substitute_token(match):
+        token = match.group(0)
+        if token == '{{.TotalReports}}':
+            return str(template_data['total_reports'])
+        if token == '{{.LastUpdated}}':
+            return template_data['last_updated']
+        if token.startswith('{{if .LatestReport}}'):
+            return latest_block
+        # Anything else is unhandled template syntax; drop it
+        return ''
+
+    # Prefer the baked module: the grid split, token scan, and cleanup were
+    # all done once at bake time, leaving only literal writes here. The
+    # runtime pipeline below stays as the fallback and does the same work
+    # per run: split at the grid placeholder, then one token pass per half
+    baked = _load_baked_template()
+    if baked is None:
+        split_parts = _GRID_RE.split(load_template(), maxsplit=1)
+
+    # Binary mode skips the TextIOWrapper layer; the buffer batches the card
+    # writes into a handful of write() syscalls
+    index_tmp = 'reports/index.html.tmp'
+    with open(index_tmp, 'wb', buffering=1 << 16) as f:
+        if baked is not None:
+            write_parts(f, baked.PRE_GRID)
+            has_grid = baked.HAS_GRID
+        else:
+            f.write(clean_html_template_syntax(_TOKEN_RE.sub(substitute_token, split_parts[0])).encode('utf-8'))
+            has_grid = len(split_parts) == 2
+        if has_grid:
+            f.write(f'<!-- Reports Grid -->\n        {_GRID_OPEN}'.encode('utf-8'))
+            for report in reports:
+                f.write(render_report_card(report).encode('utf-8'))
+            f.write(b'</div>')
+            if baked is not None:
+                write_parts(f, baked.POST_GRID)
+            else:
+                f.write(clean_html_template_syntax(_TOKEN_RE.sub(substitute_token, split_parts[1])).encode('utf-8'))
+    if not replace_if_changed(index_tmp, 'reports/index.html', _LAST_UPDATED_RE):
+        print("index.html unchanged, skipping rewrite")
 
     # Generate and write manifest
-    manifest_data = generate_reports_manifest(reports, reports_dir)
-    with open('reports/reports-manifest.json', 'w') as f:
-        json.dump(manifest_data, f, indent=2)
+    manifest_data = generate_reports_manifest(manifest_entries)
+    if orjson is not None:
+        manifest_bytes = orjson.dumps(manifest_data, option=orjson.OPT_INDENT_2)
+    else:
+        manifest_bytes = json.dumps(manifest_data, indent=2).encode('utf-8')
+    if not write_if_changed('reports/reports-manifest.json', manifest_bytes, _GENERATED_AT_RE):
+        print("reports-manifest.json unchanged, skipping rewrite")
+
+    save_metadata_cache(metadata_cache)
 
     print(f"Generated index.html with {len(reports)} reports")
     print(f"Generated reports-manifest.json with {len(reports)} report entries")